@@ -7,10 +7,14 @@ const { addonBuilder, serveHTTP } = require('stremio-addon-sdk');
 const fs = require('fs');
 const path = require('path');
 const https = require('https');
+const crypto = require('crypto');
 const { parse } = require('node-html-parser');
+const { sortDownloadLinks } = require('./lib/links');
 
 // Configuration
 const DB_FILE = path.join(__dirname, 'moviesda_full_db.json');
+const INDEX_FILE = path.join(__dirname, 'moviesda_title_index.json');
+const MAX_CANDIDATES = 50;
 const PORT = process.env.PORT || 7000;
 
 // Addon Manifest
@@ -54,6 +58,79 @@ function loadDatabase() {
     return movieDatabase;
 }
 
+// Global variable to cache trigram title index
+let titleIndex = null;
+
+/**
+ * Fingerprint of the database titles in order
+ * (must stay in sync with db_hash in build_title_index.py)
+ */
+function dbHash(database) {
+    const titles = database.map(movie => movie.title || '').join('\n');
+    return crypto.createHash('sha256').update(titles, 'utf8').digest('hex');
+}
+
+/**
+ * Load trigram title index built by scraper/build_title_index.py.
+ * Returns null (full scan fallback) if missing or out of sync with the DB.
+ * Only the trigram postings are kept: the IMDb lookup yields no year, so
+ * titles/years/year_buckets are used by the Python TitleIndex only.
+ */
+function loadTitleIndex() {
+    if (titleIndex === null) {
+        titleIndex = false;
+        try {
+            const index = JSON.parse(fs.readFileSync(INDEX_FILE, 'utf-8'));
+            if (index.db_hash && index.db_hash === dbHash(loadDatabase())) {
+                titleIndex = { trigrams: index.trigrams };
+                console.log(`✅ Loaded title index (${Object.keys(index.trigrams).length} trigrams)`);
+            } else {
+                console.log('⚠️  Title index is out of date, falling back to full scan');
+            }
+        } catch (error) {
+            console.log(`ℹ️  No title index loaded: ${error.message}`);
+        }
+    }
+    return titleIndex || null;
+}
+
+/**
+ * Normalize title for index lookups
+ * (must stay in sync with normalize_for_index in build_title_index.py)
+ */
+function normalizeForIndex(title) {
+    return title.toLowerCase().replace(/[^a-z0-9]+/g, ' ').trim();
+}
+
+/**
+ * Get padded trigrams of a normalized title
+ */
+function trigrams(normalized) {
+    const padded = `  ${normalized} `;
+    const grams = new Set();
+    for (let i = 0; i < padded.length - 2; i++) {
+        grams.add(padded.slice(i, i + 3));
+    }
+    return grams;
+}
+
+/**
+ * Get the movies sharing the most trigrams with a title
+ */
+function getCandidates(database, index, title) {
+    const counts = new Map();
+    for (const gram of trigrams(normalizeForIndex(title))) {
+        for (const i of index.trigrams[gram] || []) {
+            counts.set(i, (counts.get(i) || 0) + 1);
+        }
+    }
+
+    return [...counts.entries()]
+        .sort((a, b) => b[1] - a[1])
+        .slice(0, MAX_CANDIDATES)
+        .map(([i]) => database[i]);
+}
+
 /**
  * Fetch movie title from IMDb by scraping
  */
@@ -166,7 +243,11 @@ async function findMovieInDB(imdbId) {
     let bestMatch = null;
     let bestScore = 0;
 
-    for (const movie of database) {
+    // Only score a short candidate list when the title index is available
+    const index = loadTitleIndex();
+    const candidates = index ? getCandidates(database, index, imdbTitle) : database;
+
+    for (const movie of candidates) {
         const title = movie.title || '';
         if (!title || title === 'Unknown') {
             continue;
@@ -198,16 +279,28 @@ function formatStreams(movieData) {
     }
 
     const streams = [];
-    const downloadLinks = movieData.download_links;
+    const downloadLinks = sortDownloadLinks(movieData.download_links);
 
     downloadLinks.forEach((link, index) => {
+        // Structured record from the crawler: label without guessing
+        if (link.quality || link.part || link.size) {
+            const parts = ['MoviesDA 🎬'];
+            if (link.quality) parts.push(link.quality);
+            if (link.part) parts.push(`Part ${link.part}`);
+            if (link.size) parts.push(`📦 ${link.size}`);
+            parts.push(`- Link ${index + 1}`);
+
+            streams.push({ url: link.url, title: parts.join(' ') });
+            return;
+        }
+
         const stream = {
-            url: link,
+            url: link.url,
             title: `MoviesDA - Link ${index + 1}`
         };
 
         // Try to detect quality from URL
-        const linkLower = link.toLowerCase();
+        const linkLower = link.url.toLowerCase();
         if (linkLower.includes('1080p') || linkLower.includes('fhd')) {
             stream.title = `MoviesDA 🎬 1080p - Link ${index + 1}`;
         } else if (linkLower.includes('720p') || linkLower.includes('hd')) {
@@ -258,8 +351,9 @@ console.log('='.repeat(60));
 console.log('🎬 MoviesDA Stremio Addon');
 console.log('='.repeat(60));
 
-// Load database on startup
+// Load database and title index on startup
 loadDatabase();
+loadTitleIndex();
 
 console.log(`\n🚀 Starting server on http://127.0.0.1:${PORT}`);
 console.log(`\n📝 Install URL: http://127.0.0.1:${PORT}/manifest.json`);
@@ -0,0 +1,29 @@
+/**
+ * Download link utilities
+ */
+
+/**
+ * Rank of a quality label for sorting (higher is better)
+ */
+const QUALITY_RANK = { '2160p': 6, '1080p': 5, '720p': 4, '480p': 3, '360p': 2, '320p': 1, '240p': 0 };
+
+/**
+ * Normalize a download_links entry: older databases store bare URLs,
+ * newer crawls store { url, label, quality, part, size, size_mb, path }
+ */
+const toLinkRecord = (link) => (typeof link === 'string' ? { url: link } : link);
+
+/**
+ * Sort download links best first using crawl-time metadata.
+ * Accepts mixed bare URLs and records; returns records.
+ */
+function sortDownloadLinks(downloadLinks) {
+    return downloadLinks.map(toLinkRecord).sort((a, b) => {
+        const rankDiff = (QUALITY_RANK[b.quality] ?? -1) - (QUALITY_RANK[a.quality] ?? -1);
+        if (rankDiff !== 0) return rankDiff;
+        if ((a.part ?? 0) !== (b.part ?? 0)) return (a.part ?? 0) - (b.part ?? 0);
+        return (b.size_mb ?? 0) - (a.size_mb ?? 0);
+    });
+}
+
+module.exports = { QUALITY_RANK, toLinkRecord, sortDownloadLinks };
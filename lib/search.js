@@ -1,5 +1,6 @@
 const { loadDatabase } = require('./database');
 const { parse } = require('node-html-parser');
+const { sortDownloadLinks } = require('./links');
 
 /**
  * Find movie in database by IMDb ID
@@ -92,7 +93,8 @@ const getReadyStreams = async(movieData) => {
 }
 
 
-async function scrapeStreamUrl(link) {
+async function scrapeStreamUrl(linkRecord) {
+    const link = linkRecord.url;
     // Convert URL from db format to correct format
     // From: https://movies.downloadpage.site/download/file/52198
     // To: https://download.moviespage.site/download/page/52198
@@ -136,6 +138,11 @@ async function scrapeStreamUrl(link) {
         return [];
     }
 
+    // Fall back to metadata captured at crawl time
+    fileName = fileName || linkRecord.label || '';
+    fileSize = fileSize || linkRecord.size || '';
+    videoSize = videoSize || linkRecord.quality || '';
+
     console.log({ fileName, fileSize, videoSize, format, duration, addedOn });
 
     const downloadElement = root.querySelector('.download');
@@ -189,7 +196,7 @@ async function scrapeStreamUrl(link) {
 async function scrapeAllStreams(downloadLinks) {
     const streams = [];
 
-    for (const link of downloadLinks) {
+    for (const link of sortDownloadLinks(downloadLinks)) {
         const linkStreams = await scrapeStreamUrl(link);
         if (linkStreams && linkStreams.length > 0) {
             streams.push(...linkStreams);
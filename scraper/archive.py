@@ -0,0 +1,95 @@
+"""
+Append-only, compressed archive of raw HTTP response bodies (WARC-like).
+
+Each response is written as its own gzip member holding a WARC-style
+header block followed by the body, so the archive can be appended to
+across runs and any record can be read back by offset. A JSONL index
+alongside it maps URL and fetch time to the record's offset and length.
+"""
+
+import gzip
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterator, Optional
+
+ARCHIVE_FILE = "moviesda_archive.warc.gz"
+INDEX_FILE = "moviesda_archive.idx.jsonl"
+
+
+class ResponseArchive:
+    """Thread-safe writer for the response archive and its index."""
+
+    def __init__(self, archive_file: str = ARCHIVE_FILE, index_file: str = INDEX_FILE):
+        self.archive_file = archive_file
+        self.index_file = index_file
+        self.lock = threading.Lock()
+
+    def record(self, url: str, body: str, kind: str = "page", status: int = 200) -> None:
+        """Append one response body to the archive and index it."""
+        fetched_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        payload = body.encode("utf-8")
+        header = (
+            "WARC/1.0\r\n"
+            "WARC-Type: response\r\n"
+            f"WARC-Target-URI: {url}\r\n"
+            f"WARC-Date: {fetched_at}\r\n"
+            f"X-Moviesda-Kind: {kind}\r\n"
+            f"X-Http-Status: {status}\r\n"
+            "Content-Type: text/html; charset=utf-8\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            "\r\n"
+        ).encode("utf-8")
+        member = gzip.compress(header + payload + b"\r\n\r\n")
+
+        with self.lock:
+            with open(self.archive_file, "ab") as f:
+                offset = f.tell()
+                f.write(member)
+            entry = {
+                "url": url,
+                "fetched_at": fetched_at,
+                "kind": kind,
+                "offset": offset,
+                "length": len(member),
+            }
+            with open(self.index_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+def iter_index(index_file: str = INDEX_FILE) -> Iterator[Dict]:
+    """Yield index entries in write order, skipping torn lines."""
+    if not os.path.exists(index_file):
+        return
+    with open(index_file, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def load_latest_index(index_file: str = INDEX_FILE) -> Dict[str, Dict]:
+    """Map each URL to the index entry of its most recent fetch."""
+    latest = {}
+    for entry in iter_index(index_file):
+        current = latest.get(entry["url"])
+        if current is None or entry["fetched_at"] >= current["fetched_at"]:
+            latest[entry["url"]] = entry
+    return latest
+
+
+def read_record(f, entry: Dict) -> Optional[str]:
+    """Read and decode the response body for an index entry."""
+    f.seek(entry["offset"])
+    data = gzip.decompress(f.read(entry["length"]))
+    header, _, rest = data.partition(b"\r\n\r\n")
+    length = None
+    for line in header.split(b"\r\n"):
+        name, _, value = line.partition(b":")
+        if name.strip().lower() == b"content-length":
+            length = int(value.strip())
+    if length is None:
+        return None
+    return rest[:length].decode("utf-8", errors="replace")
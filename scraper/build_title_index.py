@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Build a trigram title index for fuzzy IMDb-title -> DB matching.
+
+Precomputes normalised titles, year buckets and a trigram inverted index
+over a movie DB and writes them as a compact JSON artifact. addon.js loads
+its trigram postings to score only a short candidate list per stream
+request; titles, years and year buckets are only used by TitleIndex below
+for batch matching from Python.
+
+Usage:
+    python build_title_index.py [db_file] [index_file]
+"""
+
+import hashlib
+import json
+import re
+import sys
+import time
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional
+
+from fetch_imdb_ids_no_api import extract_title_and_year
+
+INPUT_FILE = "moviesda_full_db.json"
+OUTPUT_FILE = "moviesda_title_index.json"
+
+INDEX_VERSION = 2
+MAX_CANDIDATES = 50
+
+
+def normalize_for_index(title: str) -> str:
+    """
+    Lowercase, drop punctuation and collapse whitespace.
+    Must stay in sync with normalizeForIndex() in addon.js.
+    """
+    return ' '.join(re.sub(r'[^a-z0-9]+', ' ', title.lower()).split())
+
+
+def trigrams(normalized: str) -> set:
+    """Trigrams of a normalised title, padded so short words still match."""
+    padded = f"  {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def db_hash(movies: List[Dict]) -> str:
+    """
+    Fingerprint of the DB's titles in order. The index addresses movies by
+    position, so any reorder or replacement must invalidate it.
+    Must stay in sync with dbHash() in addon.js.
+    """
+    titles = '\n'.join(movie.get('title') or '' for movie in movies)
+    return hashlib.sha256(titles.encode('utf-8')).hexdigest()
+
+
+def build_index(movies: List[Dict]) -> Dict:
+    """
+    Build the index artifact. Entries are addressed by their position in
+    the DB list, so the index must be rebuilt whenever the DB changes.
+    """
+    titles = []
+    years = []
+    year_buckets: Dict[str, List[int]] = {}
+    postings: Dict[str, List[int]] = {}
+
+    for i, movie in enumerate(movies):
+        title_string = movie.get('title') or ''
+        if not title_string or title_string == 'Unknown':
+            titles.append('')
+            years.append(None)
+            continue
+
+        title, year = extract_title_and_year(title_string)
+        normalized = normalize_for_index(title or '')
+        titles.append(normalized)
+        years.append(year)
+
+        if year:
+            year_buckets.setdefault(year, []).append(i)
+        for gram in trigrams(normalized):
+            postings.setdefault(gram, []).append(i)
+
+    return {
+        'version': INDEX_VERSION,
+        'count': len(movies),
+        'db_hash': db_hash(movies),
+        'titles': titles,
+        'years': years,
+        'year_buckets': year_buckets,
+        'trigrams': postings,
+    }
+
+
+class TitleIndex:
+    """Query side of the trigram index, for batch matching from Python."""
+
+    def __init__(self, index: Dict):
+        self.titles: List[str] = index['titles']
+        self.years: List[Optional[str]] = index['years']
+        self.year_buckets: Dict[str, List[int]] = index['year_buckets']
+        self.postings: Dict[str, List[int]] = index['trigrams']
+
+    @classmethod
+    def load(cls, file_path: str, movies: Optional[List[Dict]] = None) -> 'TitleIndex':
+        """Load an index, refusing it if it was built from a different DB."""
+        with open(file_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if movies is not None and index.get('db_hash') != db_hash(movies):
+            raise ValueError(f"{file_path} is out of date for this DB; rebuild it")
+        return cls(index)
+
+    def candidates(self, title: str, year: Optional[str] = None,
+                   limit: int = MAX_CANDIDATES) -> List[int]:
+        """Entries sharing the most trigrams with title, best first."""
+        grams = trigrams(normalize_for_index(title))
+        counts = Counter()
+        for gram in grams:
+            counts.update(self.postings.get(gram, ()))
+
+        if year and year in self.year_buckets:
+            in_year = set(self.year_buckets[year])
+            year_hits = {i: c for i, c in counts.items() if i in in_year}
+            if year_hits:
+                counts = Counter(year_hits)
+
+        return [i for i, _ in counts.most_common(limit)]
+
+    def match(self, title: str, year: Optional[str] = None,
+              threshold: float = 0.5) -> tuple[Optional[int], float]:
+        """Best matching DB position for title and its similarity score."""
+        normalized = normalize_for_index(title)
+        best, best_score = None, 0.0
+        for i in self.candidates(title, year):
+            score = SequenceMatcher(None, normalized, self.titles[i]).ratio()
+            if score > best_score and score > threshold:
+                best, best_score = i, score
+        return best, best_score
+
+    def match_many(self, queries: List[tuple[str, Optional[str]]],
+                   threshold: float = 0.5) -> List[tuple[Optional[int], float]]:
+        """Match a batch of (title, year) pairs."""
+        return [self.match(title, year, threshold) for title, year in queries]
+
+
+def main():
+    input_file = sys.argv[1] if len(sys.argv) > 1 else INPUT_FILE
+    output_file = sys.argv[2] if len(sys.argv) > 2 else OUTPUT_FILE
+
+    print("🔠 Title Index Builder")
+    print("=" * 60)
+    print(f"\n📂 Loading: {input_file}")
+    try:
+        with open(input_file, 'r', encoding='utf-8') as f:
+            movies = json.load(f)
+    except FileNotFoundError:
+        print(f"❌ Error: File '{input_file}' not found!")
+        return
+    except json.JSONDecodeError as e:
+        print(f"❌ Error: Invalid JSON in '{input_file}': {e}")
+        return
+
+    start_time = time.time()
+    index = build_index(movies)
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+    elapsed_time = time.time() - start_time
+
+    print(f"📊 Summary:")
+    print(f"  • Movies indexed: {sum(1 for t in index['titles'] if t)}/{len(movies)}")
+    print(f"  • Distinct trigrams: {len(index['trigrams'])}")
+    print(f"  • Year buckets: {len(index['year_buckets'])}")
+    print(f"  • Time taken: {elapsed_time:.1f} seconds")
+    print(f"\n💾 Saved to: {output_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Consolidate any number of overlapping movie DB files into one canonical DB.
+
+Handles both record shapes used in this repo:
+- moviesda_full_db.json                      -> single "url" (absolute)
+- moviesda_full_db_with_imdb.json, scraper/
+  moviesda_data_with_main_url.json           -> "urls" list (site paths)
+
+Records are streamed from each file and hash-joined on imdb_id, URL path and
+normalised title, so every source adds linear time and memory only.
+"url"/"urls", "download_links" and "ready_streams" are merged as ordered sets.
+
+Usage:
+    python consolidate_db.py <db_file> [<db_file> ...] [-o OUTPUT] [-r REPORT]
+"""
+
+import argparse
+import json
+import re
+import time
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import urlparse
+
+from check_duplicates import normalize_title
+
+OUTPUT_FILE = "moviesda_consolidated_db.json"
+REPORT_FILE = "moviesda_consolidated_report.json"
+
+READ_CHUNK_SIZE = 1 << 16
+
+
+def iter_json_array(file_path: str) -> Iterator[Dict]:
+    """
+    Yield the objects of a top-level JSON array one at a time.
+    Only the current chunk and the object being decoded are held in memory.
+    """
+    decoder = json.JSONDecoder()
+    separator = re.compile(r'[\s,]*')
+    buffer = ""
+    pos = 0
+    started = False
+    eof = False
+
+    with open(file_path, 'r', encoding='utf-8') as f:
+        while True:
+            pos = separator.match(buffer, pos).end()
+            if pos < len(buffer):
+                if not started:
+                    if buffer[pos] != '[':
+                        raise ValueError(f"{file_path}: expected a JSON array")
+                    started = True
+                    pos += 1
+                    continue
+                if buffer[pos] == ']':
+                    return
+                try:
+                    obj, pos = decoder.raw_decode(buffer, pos)
+                    yield obj
+                    continue
+                except json.JSONDecodeError:
+                    # Object spans past the current chunk - read more
+                    if eof:
+                        raise
+
+            if eof:
+                if not started:
+                    return
+                raise ValueError(f"{file_path}: unexpected end of file")
+            chunk = f.read(READ_CHUNK_SIZE)
+            eof = not chunk
+            buffer = buffer[pos:] + chunk
+            pos = 0
+
+
+def url_key(url: str) -> Optional[str]:
+    """Reduce an absolute URL or site path to a comparable path key."""
+    if not url:
+        return None
+    path = urlparse(url).path if '://' in url else url
+    path = '/' + path.strip('/') + '/'
+    return path if path != '//' else None
+
+
+def record_keys(movie: Dict) -> List[str]:
+    """All join keys for a record, namespaced so they never collide."""
+    keys = []
+    if movie.get('imdb_id'):
+        keys.append(f"imdb:{movie['imdb_id']}")
+
+    urls = list(movie.get('urls') or [])
+    if movie.get('url'):
+        urls.append(movie['url'])
+    for url in urls:
+        key = url_key(url)
+        if key:
+            keys.append(f"url:{key}")
+
+    normalized = normalize_title(movie.get('title'))
+    if normalized:
+        keys.append(f"title:{normalized}")
+    return keys
+
+
+def merge_unique(target: List, values) -> None:
+    """Append values not already present in target (order preserving)."""
+    seen = set(target)
+    for value in values or []:
+        if value not in seen:
+            seen.add(value)
+            target.append(value)
+
+
+def link_url(link) -> str:
+    """download_links entries are bare URLs or metadata records with a "url"."""
+    return link['url'] if isinstance(link, dict) else link
+
+
+def merge_links(target: List, values) -> None:
+    """Merge download links by URL, upgrading bare URLs to metadata records."""
+    positions = {link_url(link): i for i, link in enumerate(target)}
+    for link in values or []:
+        url = link_url(link)
+        if url not in positions:
+            positions[url] = len(target)
+            target.append(link)
+        elif isinstance(link, dict) and not isinstance(target[positions[url]], dict):
+            target[positions[url]] = link
+
+
+class Consolidator:
+    """Union-find over movie records, keyed by hash tables of join keys."""
+
+    def __init__(self):
+        self.parent: List[int] = []
+        self.movies: List[Dict] = []
+        self.sources: List[set] = []
+        self.members: List[List[Dict]] = []
+        self.key_index: Dict[str, int] = {}
+        self.imdb_conflicts: List[Dict] = []
+
+    def find(self, i: int) -> int:
+        root = i
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[i] != root:
+            self.parent[i], i = root, self.parent[i]
+        return root
+
+    def union(self, a: int, b: int) -> int:
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return a
+        # Keep the earlier record as root so the first source stays canonical
+        if b < a:
+            a, b = b, a
+        self.parent[b] = a
+        self.merge_into(a, b)
+        return a
+
+    def merge_into(self, root: int, other: int) -> None:
+        target = self.movies[root]
+        source = self.movies[other]
+
+        if target.get('title', 'Unknown') == 'Unknown' and source.get('title'):
+            target['title'] = source['title']
+
+        if source.get('imdb_id'):
+            if not target.get('imdb_id'):
+                target['imdb_id'] = source['imdb_id']
+            elif target['imdb_id'] != source['imdb_id']:
+                self.imdb_conflicts.append({
+                    'title': target.get('title'),
+                    'kept': target['imdb_id'],
+                    'dropped': source['imdb_id'],
+                    'dropped_title': source.get('title'),
+                })
+
+        merge_unique(target['urls'], source['urls'])
+        merge_links(target['download_links'], source['download_links'])
+        if source.get('ready_streams'):
+            streams = target.setdefault('ready_streams', [])
+            known = {s.get('url') for s in streams}
+            for stream in source['ready_streams']:
+                if stream.get('url') not in known:
+                    known.add(stream.get('url'))
+                    streams.append(stream)
+
+        self.sources[root] |= self.sources[other]
+        self.members[root].extend(self.members[other])
+        self.movies[other] = None
+        self.sources[other] = None
+        self.members[other] = None
+
+    def add(self, movie: Dict, source_name: str) -> None:
+        index = len(self.movies)
+        urls = []
+        if movie.get('url'):
+            merge_unique(urls, [url_key(movie['url'])])
+        merge_unique(urls, [url_key(u) for u in movie.get('urls') or [] if url_key(u)])
+
+        record = {
+            'imdb_id': movie.get('imdb_id'),
+            'title': movie.get('title') or 'Unknown',
+            'urls': urls,
+            'download_links': [],
+        }
+        merge_links(record['download_links'], movie.get('download_links'))
+        if movie.get('ready_streams'):
+            record['ready_streams'] = list(movie['ready_streams'])
+        if not record['imdb_id']:
+            del record['imdb_id']
+
+        self.parent.append(index)
+        self.movies.append(record)
+        self.sources.append({source_name})
+        self.members.append([{
+            'source': source_name,
+            'title': record['title'],
+            'url': urls[0] if urls else None,
+        }])
+
+        root = index
+        for key in record_keys(movie):
+            existing = self.key_index.get(key)
+            if existing is None:
+                self.key_index[key] = root
+            else:
+                root = self.union(existing, root)
+                self.key_index[key] = root
+
+    def results(self) -> Iterator[tuple[Dict, set, List[Dict]]]:
+        for i, movie in enumerate(self.movies):
+            if movie is not None and self.parent[i] == i:
+                yield movie, self.sources[i], self.members[i]
+
+
+def consolidate(files: List[str], output_file: str, report_file: str) -> None:
+    """Stream every file through the consolidator and write DB plus report."""
+    consolidator = Consolidator()
+    source_counts = {}
+    start_time = time.time()
+
+    for file_path in files:
+        print(f"📂 Streaming: {file_path}")
+        count = 0
+        try:
+            for movie in iter_json_array(file_path):
+                consolidator.add(movie, file_path)
+                count += 1
+        except FileNotFoundError:
+            print(f"❌ File not found: {file_path}")
+            continue
+        except (ValueError, json.JSONDecodeError) as e:
+            print(f"❌ Invalid JSON in {file_path}: {e}")
+            continue
+        source_counts[file_path] = count
+        print(f"   ✅ {count} records")
+
+    canonical = []
+    only_in = {name: [] for name in source_counts}
+    merged_groups = []
+    in_all = 0
+    for movie, sources, members in consolidator.results():
+        canonical.append(movie)
+        summary = {
+            'title': movie['title'],
+            'imdb_id': movie.get('imdb_id'),
+            'url': movie['urls'][0] if movie['urls'] else None,
+        }
+        if len(sources) == 1:
+            only_in[next(iter(sources))].append(summary)
+        elif len(sources) == len(source_counts):
+            in_all += 1
+        if len(members) > 1:
+            merged_groups.append({**summary, 'records': members})
+
+    report = {
+        'summary': {
+            'sources': source_counts,
+            'total_input_records': sum(source_counts.values()),
+            'canonical_movies': len(canonical),
+            'movies_in_all_sources': in_all,
+            'movies_only_in_source': {name: len(movies) for name, movies in only_in.items()},
+            'merged_groups': len(merged_groups),
+            'movies_without_imdb_id': sum(1 for m in canonical if not m.get('imdb_id')),
+            'imdb_conflicts': len(consolidator.imdb_conflicts),
+        },
+        'movies_only_in_source': only_in,
+        'merged_groups': merged_groups,
+        'imdb_conflicts': consolidator.imdb_conflicts,
+    }
+
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(canonical, f, ensure_ascii=False, indent=2)
+    with open(report_file, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    elapsed_time = time.time() - start_time
+    print("\n" + "=" * 60)
+    print("📊 Summary:")
+    print(f"  • Input records: {report['summary']['total_input_records']}")
+    print(f"  • Canonical movies: {report['summary']['canonical_movies']}")
+    print(f"  • Present in all sources: {in_all}")
+    print(f"  • Merged groups: {len(merged_groups)}")
+    for name, movies in only_in.items():
+        print(f"  • Only in {name}: {len(movies)}")
+    print(f"  • IMDb ID conflicts: {len(consolidator.imdb_conflicts)}")
+    print(f"  • Time taken: {elapsed_time:.1f} seconds")
+    print(f"\n💾 Saved DB to: {output_file}")
+    print(f"💾 Saved report to: {report_file}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge overlapping MoviesDA DB files.")
+    parser.add_argument('files', nargs='+', help="JSON database files, in priority order")
+    parser.add_argument('-o', '--output', default=OUTPUT_FILE, help="Canonical DB output path")
+    parser.add_argument('-r', '--report', default=REPORT_FILE, help="Diff report output path")
+    args = parser.parse_args()
+
+    consolidate(args.files, args.output, args.report)
+
+
+if __name__ == "__main__":
+    main()
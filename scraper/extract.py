@@ -0,0 +1,181 @@
+"""
+HTML extraction logic shared by the live crawler (scraper.py) and offline
+archive replay (replay_archive.py).
+
+Everything here works on page HTML only - no network access - so a parser
+fix can be re-applied to archived responses without re-crawling.
+"""
+
+import re
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from bs4 import BeautifulSoup
+
+# Download link metadata, read from the quality/part page trail
+quality_pattern = re.compile(r'\b(2160p|4k|1080p|720p|480p|360p|320p|240p)\b', re.IGNORECASE)
+part_pattern = re.compile(r'\b(?:part|episode|ep|disc)\s*[-:.]?\s*(\d+)\b', re.IGNORECASE)
+size_pattern = re.compile(r'(\d+(?:\.\d+)?)\s*(GB|MB|KB)\b', re.IGNORECASE)
+file_size_pattern = re.compile(r'File\s*Size\s*:?\s*(\d+(?:\.\d+)?\s*(?:GB|MB|KB))', re.IGNORECASE)
+size_units_mb = {"GB": 1024, "MB": 1, "KB": 1 / 1024}
+
+
+def normalize_link(href: str, base_url: str) -> str:
+    """Make site-relative links absolute."""
+    if href.startswith('/'):
+        return base_url + href
+    return href
+
+
+def extract_listing_links(html: str, base_url: str, selector: str = '.f>a') -> List[str]:
+    """Movie page URLs from a letter listing or latest updates page."""
+    soup = BeautifulSoup(html, "html.parser")
+    links = []
+    for a in soup.select(selector):
+        movie_url = normalize_link(a.get('href', ''), base_url)
+        if movie_url:
+            links.append(movie_url)
+    return links
+
+
+def link_item_text(link) -> str:
+    """Text of the listing item a link sits in (title, quality, size...)."""
+    item = link.find_parent(class_=["f", "dlink"]) or link
+    return item.get_text(" ", strip=True)
+
+
+def parse_link_metadata(href: str, trail: List[str], page_url: str, extra_text=()) -> Dict:
+    """
+    Build a structured download link record from the labels of the pages
+    walked to reach it (deepest label wins for quality/part/size).
+    """
+    quality = part = size = size_mb = None
+    for text in list(trail) + list(extra_text):
+        match = quality_pattern.findall(text)
+        if match:
+            quality = match[-1].lower().replace("4k", "2160p")
+        match = part_pattern.findall(text)
+        if match:
+            part = int(match[-1])
+        match = size_pattern.findall(text)
+        if match:
+            value, unit = match[-1]
+            size = f"{value} {unit.upper()}"
+            size_mb = round(float(value) * size_units_mb[unit.upper()], 2)
+
+    return {
+        "url": href,
+        "label": trail[-1] if trail else None,
+        "quality": quality,
+        "part": part,
+        "size": size,
+        "size_mb": size_mb,
+        "path": urlparse(page_url).path,
+    }
+
+
+def child_queue_entries(soup, base_url: str, trail: List[str]) -> List[list]:
+    """[url, trail] BFS queue entries for the quality/part links on a page."""
+    entries = []
+    for link in soup.select('.f a'):
+        link_url = normalize_link(link.get('href', ''), base_url)
+        if link_url:
+            entries.append([link_url, trail + [link_item_text(link)]])
+    return entries
+
+
+def extract_movie_page(html: str, base_url: str) -> Tuple[str, List[list]]:
+    """Movie title and initial BFS queue from a movie's main page."""
+    soup = BeautifulSoup(html, "html.parser")
+    lines = soup.select(".line")
+    title_tag = lines[1] if len(lines) > 1 else None
+    movie_title = title_tag.get_text(strip=True) if title_tag else "Unknown"
+    return movie_title, child_queue_entries(soup, base_url, [])
+
+
+def extract_link_page(html: str, base_url: str, page_url: str,
+                      trail: List[str]) -> Tuple[List[list], List[Dict]]:
+    """Child queue entries and download link records from a quality/part page."""
+    soup = BeautifulSoup(html, "html.parser")
+    children = child_queue_entries(soup, base_url, trail)
+
+    download_links = []
+    dlinks = soup.select(".dlink a")
+    if dlinks:
+        file_size = file_size_pattern.search(soup.get_text(" ", strip=True))
+        for link in dlinks:
+            href = link.get('href', '')
+            if href:
+                extra_text = [link_item_text(link)]
+                if file_size:
+                    extra_text.append(file_size.group(0))
+                download_links.append(parse_link_metadata(href, trail, page_url, extra_text))
+    return children, download_links
+
+
+def dedupe_download_links(download_links: List[Dict]) -> List[Dict]:
+    """De-duplicate by URL, keeping the first (shallowest) record."""
+    unique_links = {}
+    for link in download_links:
+        unique_links.setdefault(link["url"], link)
+    return list(unique_links.values())
+
+
+def walk_movie(movie_url: str, fetch_html: Callable[[str, str], Optional[str]],
+               base_url: str, state: Optional[Dict] = None,
+               on_start: Optional[Callable[[str, List[list]], None]] = None,
+               on_link: Optional[Callable[[str, List[list], List[Dict]], None]] = None,
+               skip_title: Optional[Callable[[str], bool]] = None) -> Optional[Dict]:
+    """
+    Walk a movie's quality/part pages breadth-first and build its DB record.
+
+    Shared by the live crawler and archive replay so both run the same walk.
+    fetch_html(url, kind) returns page HTML or None (kind is "movie" for
+    the movie's main page, "page" for quality/part pages). state resumes a
+    partial walk ({"title", "queue", "download_links"}) without refetching
+    the main page. on_start(title, queue) and on_link(url, children,
+    download_links) are called as the walk progresses (for checkpoints).
+    If skip_title(title) is true for the parsed title, the quality/part
+    pages are not walked and the record has no download links.
+
+    Returns None if the movie's main page could not be fetched.
+    """
+    if state:
+        movie_title = state["title"]
+        link_queue = deque(state["queue"])
+        download_links = list(state["download_links"])
+    else:
+        html = fetch_html(movie_url, "movie")
+        if html is None:
+            return None
+        movie_title, queue = extract_movie_page(html, base_url)
+        if skip_title and skip_title(movie_title):
+            return {"url": movie_url, "title": movie_title, "download_links": []}
+        link_queue = deque(queue)
+        download_links = []
+        if on_start:
+            on_start(movie_title, list(link_queue))
+
+    while link_queue:
+        current_url, trail = link_queue.popleft()
+        html = fetch_html(current_url, "page")
+
+        children = []
+        page_download_links = []
+        if html is not None:
+            try:
+                children, page_download_links = extract_link_page(html, base_url, current_url, trail)
+            except Exception:
+                children, page_download_links = [], []
+
+        link_queue.extend(children)
+        download_links.extend(page_download_links)
+        if on_link:
+            on_link(current_url, children, page_download_links)
+
+    return {
+        "url": movie_url,
+        "title": movie_title,
+        "download_links": dedupe_download_links(download_links),
+    }
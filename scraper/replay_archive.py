@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Re-derive the movie DB from a recorded response archive, with no network.
+
+Run the crawler with "python scraper.py --record" to build the archive,
+then after fixing an extraction bug in extract.py re-run the extraction
+over every archived movie across all CPU cores.
+
+Only movies whose main page is in the archive are replayed. A --record run
+skips movies already in the DB, so those are never archived: to be able to
+re-derive the whole DB, record a fresh crawl against an empty DB (e.g. with
+the existing DB moved aside). Use --merge to overlay the replayed records
+onto an existing DB, by URL or, for DB records without one, by title.
+
+Usage:
+    python replay_archive.py [-o OUTPUT] [--merge DB_FILE] [-j WORKERS]
+                             [--archive FILE] [--index FILE]
+"""
+
+import argparse
+import json
+import os
+import time
+from multiprocessing import Pool
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from archive import ARCHIVE_FILE, INDEX_FILE, load_latest_index, read_record
+from check_duplicates import normalize_title
+from extract import extract_listing_links, walk_movie
+
+OUTPUT_FILE = "moviesda_full_db_replayed.json"
+
+# Per-worker state, set up once by init_worker
+_archive = None
+_index: Dict[str, Dict] = {}
+
+
+def init_worker(archive_file: str, index: Dict[str, Dict]) -> None:
+    global _archive, _index
+    _archive = open(archive_file, "rb")
+    _index = index
+
+
+def fetch_archived(url: str, kind: str = "page") -> Optional[str]:
+    """Archived body of the latest fetch of url, or None if never fetched."""
+    entry = _index.get(url)
+    if entry is None:
+        return None
+    try:
+        return read_record(_archive, entry)
+    except (OSError, EOFError, ValueError):
+        return None
+
+
+def replay_movie(movie_url: str) -> Optional[Dict]:
+    parsed = urlparse(movie_url)
+    return walk_movie(movie_url, fetch_archived, f"{parsed.scheme}://{parsed.netloc}")
+
+
+def listing_sort_key(url: str):
+    """Order letter listing pages the way the crawler walks them."""
+    parsed = urlparse(url)
+    page = parse_qs(parsed.query).get("page", ["1"])[0]
+    return parsed.path, int(page) if page.isdigit() else 0
+
+
+def find_movie_roots(archive_file: str, index: Dict[str, Dict]) -> List[str]:
+    """
+    Archived movie pages to replay: those on archived letter listings
+    first (in crawl order), then the rest (e.g. from discovery mode).
+    Listed movies without an archived page are skipped.
+    """
+    roots = {}
+    listings = sorted(
+        (url for url, entry in index.items()
+         if entry.get("kind") == "listing" and "/tamil-movies/" in url),
+        key=listing_sort_key,
+    )
+    with open(archive_file, "rb") as f:
+        for url in listings:
+            html = read_record(f, index[url])
+            if html is None:
+                continue
+            parsed = urlparse(url)
+            for movie_url in extract_listing_links(html, f"{parsed.scheme}://{parsed.netloc}"):
+                if index.get(movie_url, {}).get("kind") == "movie":
+                    roots.setdefault(movie_url, True)
+
+    for entry in index.values():
+        if entry.get("kind") == "movie":
+            roots.setdefault(entry["url"], True)
+    return list(roots)
+
+
+def merge_into_db(db_file: str, replayed: List[Dict]) -> List[Dict]:
+    """
+    Overlay replayed records onto an existing DB. Records with the same URL
+    are replaced in place; DB records without a URL are matched (and
+    replaced) by normalised title. Other fields of the old record, such as
+    imdb_id, are kept. New movies are appended unless their title exists.
+    """
+    with open(db_file, "r", encoding="utf-8") as f:
+        movie_db = json.load(f)
+
+    positions = {movie.get("url"): i for i, movie in enumerate(movie_db) if movie.get("url")}
+    title_positions = {}
+    for i, movie in enumerate(movie_db):
+        normalized = normalize_title(movie.get("title"))
+        if normalized and not movie.get("url"):
+            title_positions.setdefault(normalized, i)
+    titles = {normalize_title(movie.get("title")) for movie in movie_db} - {None}
+    replaced = added = 0
+    for movie in replayed:
+        normalized = normalize_title(movie["title"])
+        if movie["url"] in positions:
+            i = positions[movie["url"]]
+        elif normalized in title_positions:
+            i = title_positions.pop(normalized)
+            positions[movie["url"]] = i
+        else:
+            i = None
+
+        if i is not None:
+            movie_db[i] = {**movie_db[i], **movie}
+            replaced += 1
+        elif normalized not in titles:
+            movie_db.append(movie)
+            added += 1
+    print(f"🔀 Merged into {db_file}: {replaced} replaced, {added} added")
+    return movie_db
+
+
+def replay(archive_file: str, index_file: str, output_file: str, workers: int,
+           merge_file: Optional[str] = None) -> None:
+    print("📼 Archive Replay")
+    print("=" * 60)
+
+    if not os.path.exists(archive_file):
+        print(f"❌ Archive not found: {archive_file}")
+        print("   Record one with: python scraper.py --record")
+        return
+
+    start_time = time.time()
+    index = load_latest_index(index_file)
+    print(f"\n📂 Indexed {len(index)} archived URLs")
+
+    movie_urls = find_movie_roots(archive_file, index)
+    print(f"🎬 Movies to re-extract: {len(movie_urls)}")
+    print(f"🚀 Using {workers} worker processes")
+
+    movie_db = []
+    seen_urls = set()
+    seen_titles = set()
+    duplicates = 0
+    unreadable = 0
+    with Pool(workers, initializer=init_worker, initargs=(archive_file, index)) as pool:
+        for movie in pool.imap(replay_movie, movie_urls, chunksize=16):
+            if movie is None:
+                unreadable += 1
+                continue
+            # Same URL + title duplicate rules as the crawler
+            normalized = normalize_title(movie["title"])
+            if movie["url"] in seen_urls or (normalized and normalized in seen_titles):
+                duplicates += 1
+                continue
+            seen_urls.add(movie["url"])
+            if normalized:
+                seen_titles.add(normalized)
+            movie_db.append(movie)
+
+    extracted = len(movie_db)
+    if merge_file:
+        movie_db = merge_into_db(merge_file, movie_db)
+
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump(movie_db, f, ensure_ascii=False, indent=2)
+
+    elapsed_time = time.time() - start_time
+    print("\n" + "=" * 60)
+    print("📊 Summary:")
+    print(f"  • Movies extracted: {extracted}")
+    print(f"  • Duplicates skipped: {duplicates}")
+    print(f"  • Unreadable archive records: {unreadable}")
+    print(f"  • Movies in output: {len(movie_db)}")
+    print(f"  • Time taken: {elapsed_time:.1f} seconds")
+    print(f"\n💾 Saved to: {output_file}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-extract the movie DB from a response archive.")
+    parser.add_argument('-o', '--output', default=OUTPUT_FILE, help="Output DB path")
+    parser.add_argument('--merge', metavar='DB_FILE', help="Overlay replayed records onto this DB")
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument('--archive', default=ARCHIVE_FILE, help="Archive file")
+    parser.add_argument('--index', default=INDEX_FILE, help="Archive index file")
+    args = parser.parse_args()
+
+    replay(args.archive, args.index, args.output, args.workers, args.merge)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,19 @@
 from ctypes import sizeof
 import requests
-from bs4 import BeautifulSoup
 import string
 import time
 import json
-from collections import deque
 from requests.exceptions import ConnectionError, Timeout, RequestException
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
+import os
+import re
+import sys
+import xml.etree.ElementTree as ET
+from urllib.parse import urlparse
+
+from archive import ResponseArchive
+from extract import extract_listing_links, walk_movie
 
 base_url = "https://moviesda1.io"
 letters = list(string.ascii_lowercase)
@@ -16,6 +22,28 @@ processed_urls = set()  # Track processed movie URLs to avoid duplicates
 processed_titles = set()  # Track processed movie titles to avoid duplicates
 output_file = "moviesda_full_db.json"
 
+# Movie URLs skipped because their title is already in the DB (often reposts
+# of DB records that have no "url"), kept so discovery never re-fetches them
+skipped_urls_file = "moviesda_skipped_urls.json"
+skipped_urls = set()
+
+# Crawl frontier checkpoint (append-only journal, removed after a clean run)
+checkpoint_file = "moviesda_crawl_checkpoint.jsonl"
+frontier = {
+    "letters": {},          # letter -> {"next_page", "links", "done"}
+    "pending_movies": {},   # movie URLs queued but not finished (ordered)
+    "movies": {},           # in-flight movie URL -> {"title", "queue", "download_links"}
+}
+
+# Discovery mode settings (fast path for new releases)
+sitemap_url = f"{base_url}/sitemap.xml"
+latest_updates_url = f"{base_url}/"
+# Movie pages end in "-movie/", "-moviesda/" or a "-movie-1/" style repost
+movie_url_pattern = re.compile(r'-(?:movie|moviesda)(?:-\d+)?/?$')
+
+# Raw response archive for offline re-extraction (enabled with "--record")
+response_archive = None
+
 # Parallel processing settings
 MAX_WORKERS_LETTERS = 5   # Process 5 letters at a time
 MAX_WORKERS_MOVIES = 10   # Process 10 movies per letter in parallel
@@ -26,6 +54,7 @@ url_lock = threading.Lock()
 title_lock = threading.Lock()
 save_lock = threading.Lock()
 print_lock = threading.Lock()
+checkpoint_lock = threading.Lock()
 
 def normalize_title(title):
     """
@@ -67,12 +96,142 @@ def save_to_json(data, filename):
             json.dump(data, f, ensure_ascii=False, indent=2)
         print(f"  💾 Saved {len(data)} records to {filename}")
 
+def load_skipped_urls(filename):
+    """Load the URLs skipped as title duplicates by earlier runs."""
+    try:
+        with open(filename, "r", encoding="utf-8") as f:
+            return set(json.load(f))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return set()
+
+def save_skipped_urls(filename):
+    """Save the URLs skipped as title duplicates (thread-safe)."""
+    with url_lock:
+        urls = sorted(skipped_urls)
+    with save_lock:
+        with open(filename, "w", encoding="utf-8") as f:
+            json.dump(urls, f, ensure_ascii=False, indent=2)
+
+def checkpoint_event(event):
+    """Append one frontier event to the checkpoint journal (thread-safe)."""
+    line = json.dumps(event, ensure_ascii=False)
+    with checkpoint_lock:
+        with open(checkpoint_file, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+def upgrade_queue_entry(entry):
+    """Journals from before link metadata stored queue entries as bare URLs."""
+    return [entry, []] if isinstance(entry, str) else entry
+
+def upgrade_download_link(link):
+    """Journals from before link metadata stored download links as bare URLs."""
+    if isinstance(link, str):
+        return {"url": link, "label": None, "quality": None, "part": None,
+                "size": None, "size_mb": None, "path": None}
+    return link
+
+def apply_checkpoint_event(event):
+    """Replay a single journal event onto the in-memory frontier."""
+    kind = event.get("t")
+    if kind == "letter_page":
+        state = frontier["letters"].setdefault(event["letter"], {"next_page": 1, "links": [], "done": False})
+        state["links"].extend(event["links"])
+        state["next_page"] = event["page"] + 1
+    elif kind == "letter_done":
+        state = frontier["letters"].setdefault(event["letter"], {"next_page": 1, "links": [], "done": False})
+        state["done"] = True
+    elif kind == "queued":
+        for movie_url in event["urls"]:
+            frontier["pending_movies"][movie_url] = True
+    elif kind == "movie_start":
+        frontier["movies"][event["url"]] = {
+            "title": event["title"],
+            "queue": [upgrade_queue_entry(entry) for entry in event["queue"]],
+            "download_links": [],
+        }
+    elif kind == "movie_link":
+        state = frontier["movies"].get(event["url"])
+        if state is None:
+            return
+        for i, (link_url, _) in enumerate(state["queue"]):
+            if link_url == event["link"]:
+                del state["queue"][i]
+                break
+        state["queue"].extend(upgrade_queue_entry(entry) for entry in event["children"])
+        state["download_links"].extend(upgrade_download_link(link) for link in event["download_links"])
+    elif kind == "movie_done":
+        movie_url = event["url"]
+        frontier["pending_movies"].pop(movie_url, None)
+        frontier["movies"].pop(movie_url, None)
+        movie_data = event.get("movie")
+        if event.get("duplicate"):
+            skipped_urls.add(movie_url)
+        if movie_url not in processed_urls:
+            # Finished after the last DB save - restore it instead of re-fetching
+            if movie_data:
+                movie_db.append(movie_data)
+                mark_movie_as_processed(movie_url, movie_data.get("title"))
+            else:
+                processed_urls.add(movie_url)
+
+def load_checkpoint():
+    """Rebuild the crawl frontier from the checkpoint journal, if any."""
+    if not os.path.exists(checkpoint_file):
+        return False
+    
+    events = 0
+    with open(checkpoint_file, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Partial line from an interrupted write
+            apply_checkpoint_event(event)
+            events += 1
+    
+    # Make sure new events never get glued onto a torn last line
+    with open(checkpoint_file, "rb+") as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+    
+    print(f"♻️  Resuming from checkpoint: {events} events replayed")
+    print(f"   📄 {sum(1 for s in frontier['letters'].values() if s['done'])} letters fully listed, "
+          f"{len(frontier['pending_movies'])} movies pending, {len(frontier['movies'])} in flight")
+    return True
+
+def clear_checkpoint():
+    """Remove the checkpoint journal after a clean finish."""
+    with checkpoint_lock:
+        if os.path.exists(checkpoint_file):
+            os.remove(checkpoint_file)
+
+def compact_checkpoint():
+    """
+    Rewrite the journal keeping only the letter pagination frontier.
+    Used after a discovery run, which finishes pending movies but never
+    walks the letters, so an interrupted full crawl can still resume them.
+    """
+    temp_file = checkpoint_file + ".tmp"
+    with checkpoint_lock:
+        with open(temp_file, "w", encoding="utf-8") as f:
+            for letter, state in frontier["letters"].items():
+                if state["next_page"] > 1:
+                    event = {"t": "letter_page", "letter": letter,
+                             "page": state["next_page"] - 1, "links": state["links"]}
+                    f.write(json.dumps(event, ensure_ascii=False) + "\n")
+                if state["done"]:
+                    f.write(json.dumps({"t": "letter_done", "letter": letter}) + "\n")
+        os.replace(temp_file, checkpoint_file)
+
 def safe_print(message):
     """Thread-safe print function."""
     with print_lock:
         print(message)
 
-def retry_request(url, max_retries=3, timeout=10, backoff_factor=2):
+def retry_request(url, max_retries=3, timeout=10, backoff_factor=2, kind="page", stream=False):
     """
     Retry a request with exponential backoff on failure.
     
@@ -81,14 +240,18 @@ def retry_request(url, max_retries=3, timeout=10, backoff_factor=2):
         max_retries: Maximum number of retry attempts
         timeout: Request timeout in seconds
         backoff_factor: Multiplier for delay between retries
+        kind: Page kind stored in the response archive (listing/movie/page)
+        stream: Return without reading the body; the caller must archive it
     
     Returns:
         Response object if successful, None if all retries failed
     """
     for attempt in range(max_retries):
         try:
-            resp = requests.get(url, timeout=timeout)
+            resp = requests.get(url, timeout=timeout, stream=stream)
             resp.raise_for_status()  # Raise an exception for bad status codes
+            if response_archive is not None and not stream:
+                response_archive.record(url, resp.text, kind, resp.status_code)
             return resp
         except (ConnectionError, Timeout, RequestException) as e:
             if attempt < max_retries - 1:
@@ -103,8 +266,13 @@ def retry_request(url, max_retries=3, timeout=10, backoff_factor=2):
 
 def get_movies_from_letter(letter):
     """Fetch all movie links for a given letter across all pages."""
-    movie_links = []
-    page = 1
+    # Resume pagination from the checkpoint instead of re-fetching pages
+    state = frontier["letters"].get(letter)
+    if state and state["done"]:
+        safe_print(f"  ✓ [{letter}] Listing restored from checkpoint: {len(state['links'])} movies")
+        return list(state["links"])
+    movie_links = list(state["links"]) if state else []
+    page = state["next_page"] if state else 1
     
     while True:
         if page == 1:
@@ -113,22 +281,18 @@ def get_movies_from_letter(letter):
             url = f"{base_url}/tamil-movies/{letter}/?page={page}"
         
         safe_print(f"    [{letter}] Fetching page {page}...")
-        resp = retry_request(url)
+        resp = retry_request(url, kind="listing")
         if resp is None:
             safe_print(f"      [{letter}] Failed to fetch page {page}, skipping...")
             break
-        soup = BeautifulSoup(resp.text, "html.parser")
         
-        page_movie_links = []
-        for a in soup.select('.f>a'): 
-            movie_url = a['href']
-            if movie_url.startswith('/'):
-                movie_url = base_url + movie_url
-            page_movie_links.append(movie_url)
+        page_movie_links = extract_listing_links(resp.text, base_url)
         
         if len(page_movie_links)==0:
+            checkpoint_event({"t": "letter_done", "letter": letter})
             break
         
+        checkpoint_event({"t": "letter_page", "letter": letter, "page": page, "links": page_movie_links})
         movie_links.extend(page_movie_links)
         safe_print(f"      [{letter}] Found {len(page_movie_links)} movies on page {page}")
         
@@ -138,67 +302,131 @@ def get_movies_from_letter(letter):
     safe_print(f"  ✓ [{letter}] Total movies found: {len(movie_links)}")
     return movie_links
 
-def get_download_items(movie_url):
-    """Fetch download links for a specific movie URL."""
-    def normalize_and_add_to_queue(links, queue):
-        """Helper function to normalize URLs and add to queue"""
-        for link in links:
-            link_url = link.get('href', '')
-            if link_url.startswith('/'):
-                link_url = base_url + link_url
-            if link_url:
-                queue.append(link_url)
+def is_movie_url(url):
+    """Check whether a URL looks like a movie page on the site."""
+    parsed = urlparse(url)
+    if parsed.netloc and parsed.netloc != urlparse(base_url).netloc:
+        return False
+    return bool(movie_url_pattern.search(parsed.path))
+
+def stream_sitemap_urls(url, depth=0):
+    """
+    Yield <loc> URLs from a sitemap, parsing the XML incrementally as it
+    downloads. Nested sitemap indexes are followed (one level deep).
+    """
+    resp = retry_request(url, timeout=15, kind="sitemap", stream=True)
+    if resp is None:
+        safe_print(f"      ! Failed to fetch sitemap {url}, skipping...")
+        return
+    
+    parser = ET.XMLPullParser(events=("end",))
+    nested_sitemaps = []
+    chunks = [] if response_archive is not None else None
+    try:
+        for chunk in resp.iter_content(chunk_size=16384):
+            if chunks is not None:
+                chunks.append(chunk)
+            parser.feed(chunk)
+            for _, elem in parser.read_events():
+                tag = elem.tag.rsplit('}', 1)[-1]
+                if tag == 'loc' and elem.text:
+                    loc = elem.text.strip()
+                    if loc.endswith('.xml'):
+                        nested_sitemaps.append(loc)
+                    else:
+                        yield loc
+                elif tag in ('url', 'sitemap'):
+                    elem.clear()  # Keep memory flat on large sitemaps
+    except ET.ParseError as e:
+        safe_print(f"      ! Invalid sitemap XML at {url}: {e}")
+    except RequestException as e:
+        safe_print(f"      ! Sitemap download interrupted at {url}: {e}")
+    finally:
+        resp.close()
+    
+    # Archive the body once fully read, like every other fetch under --record
+    if chunks is not None:
+        body = b"".join(chunks).decode(resp.encoding or "utf-8", errors="replace")
+        response_archive.record(url, body, "sitemap", resp.status_code)
     
-    resp = retry_request(movie_url)
+    if depth == 0:
+        for nested in nested_sitemaps:
+            yield from stream_sitemap_urls(nested, depth + 1)
+
+def get_latest_movie_urls():
+    """Fetch movie links from the site's latest updates listing."""
+    resp = retry_request(latest_updates_url, kind="listing")
     if resp is None:
-        safe_print(f"  Failed to fetch movie page, skipping...")
-        return {"url": movie_url, "title": "Unknown", "download_links": []}
+        safe_print(f"  Failed to fetch latest updates page, skipping...")
+        return []
     
-    soup = BeautifulSoup(resp.text, "html.parser")
-    title_tag = soup.select(".line")[1] if len(soup.select(".line")) > 1 else None
-    movie_title = title_tag.get_text(strip=True) if title_tag else "Unknown"
-    safe_print(f"  📽️  {movie_title}")
+    movie_links = extract_listing_links(resp.text, base_url, selector='.f a')
+    return [movie_url for movie_url in movie_links if is_movie_url(movie_url)]
 
-    link_queue = deque()
-    download_links = [] 
+def discover_new_movies(source):
+    """
+    Discover movie URLs not yet in the database from the sitemap or the
+    latest updates page, instead of walking every letter listing.
+    """
+    safe_print(f"\n🛰️  Discovering new movies from {source}...")
+    if source == "sitemap":
+        candidates = (u for u in stream_sitemap_urls(sitemap_url) if is_movie_url(u))
+    else:
+        candidates = get_latest_movie_urls()
     
-    initial_links = soup.select(".f a")
-    normalize_and_add_to_queue(initial_links, link_queue)
+    new_movie_pages = []
+    seen = set()
+    for movie_url in candidates:
+        with url_lock:
+            if movie_url in processed_urls or movie_url in seen:
+                continue
+        seen.add(movie_url)
+        new_movie_pages.append(movie_url)
     
-    while link_queue:
-        current_url = link_queue.popleft()
-        
+    safe_print(f"  ✓ Found {len(new_movie_pages)} new movie URLs")
+    return new_movie_pages
+
+def fetch_page_html(url, kind):
+    """Live fetch callback for walk_movie (page HTML or None)."""
+    if kind == "movie":
+        resp = retry_request(url, kind="movie")
+    else:
         time.sleep(0.2)  # Reduced delay
-        resp = retry_request(current_url, max_retries=2, timeout=8)
-        
-        if resp is None:
-            continue
-        
-        try:
-            soup = BeautifulSoup(resp.text, "html.parser")
-            
-            child_links = soup.select('.f a')
-            if len(child_links) > 0:
-                normalize_and_add_to_queue(child_links, link_queue)
-            
-            current_page_download_links = soup.select(".dlink a")
-            if len(current_page_download_links) > 0:
-                for link in current_page_download_links:
-                    href = link.get('href', '')
-                    if href:
-                        download_links.append(href)
-                
-        except Exception as e:
-            continue
+        resp = retry_request(url, max_retries=2, timeout=8)
+    return resp.text if resp is not None else None
+
+def get_download_items(movie_url):
+    """Fetch download links (with quality/part/size metadata) for a movie URL."""
+    # Resume a partially walked movie from the checkpoint
+    state = frontier["movies"].pop(movie_url, None)
+    if state:
+        safe_print(f"  ♻️  {state['title']} (resuming, {len(state['queue'])} links left)")
     
-    download_links = list(set(download_links))
-    safe_print(f"    ✓ {movie_title}: {len(download_links)} download links")
+    def on_start(movie_title, queue):
+        safe_print(f"  📽️  {movie_title}")
+        checkpoint_event({"t": "movie_start", "url": movie_url, "title": movie_title, "queue": queue})
     
-    return {
-        "url": movie_url,
-        "title": movie_title,
-        "download_links": download_links,
-    }
+    def on_link(link_url, children, page_download_links):
+        checkpoint_event({
+            "t": "movie_link",
+            "url": movie_url,
+            "link": link_url,
+            "children": children,
+            "download_links": page_download_links,
+        })
+    
+    def skip_title(movie_title):
+        # Known title under another URL - don't walk its quality/part pages
+        is_dup, _ = is_duplicate_movie(movie_url, movie_title)
+        return is_dup
+    
+    movie_data = walk_movie(movie_url, fetch_page_html, base_url, state, on_start, on_link, skip_title)
+    if movie_data is None:
+        safe_print(f"  Failed to fetch movie page, skipping...")
+        return {"url": movie_url, "title": "Unknown", "download_links": []}
+    
+    safe_print(f"    ✓ {movie_data['title']}: {len(movie_data['download_links'])} download links")
+    return movie_data
 
 def is_duplicate_movie(movie_url, movie_title=None):
     """
@@ -248,6 +476,10 @@ def process_movie(movie_url, new_movies_counter):
         is_dup, reason = is_duplicate_movie(movie_url, movie_title)
         if is_dup:
             safe_print(f"  ⏭️  Skipping (duplicate detected): {reason}")
+            with url_lock:
+                processed_urls.add(movie_url)
+                skipped_urls.add(movie_url)
+            checkpoint_event({"t": "movie_done", "url": movie_url, "movie": None, "duplicate": True})
             return None
         
         # Mark as processed
@@ -257,6 +489,7 @@ def process_movie(movie_url, new_movies_counter):
         with db_lock:
             movie_db.append(movie_data)
             new_movies_counter[0] += 1
+        checkpoint_event({"t": "movie_done", "url": movie_url, "movie": movie_data})
             
         return movie_data
     except Exception as e:
@@ -264,8 +497,26 @@ def process_movie(movie_url, new_movies_counter):
         # Still mark URL as processed to avoid infinite retries
         with url_lock:
             processed_urls.add(movie_url)
+        checkpoint_event({"t": "movie_done", "url": movie_url, "movie": None})
         return None
 
+def process_movie_pages(movie_pages, new_movies_counter, save_interval):
+    """Process a batch of movie page URLs in parallel, saving periodically."""
+    checkpoint_event({"t": "queued", "urls": movie_pages})
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS_MOVIES) as executor:
+        futures = [executor.submit(process_movie, mp, new_movies_counter) for mp in movie_pages]
+        
+        completed = 0
+        for future in as_completed(futures):
+            completed += 1
+            
+            # Save progress periodically
+            if new_movies_counter[0] % save_interval == 0 and new_movies_counter[0] > 0:
+                with db_lock:
+                    save_to_json(movie_db, output_file)
+                    save_skipped_urls(skipped_urls_file)
+                    safe_print(f"    📊 Progress: {new_movies_counter[0]} new movies, {len(movie_db)} total")
+
 def process_letter(letter, new_movies_counter, save_interval):
     """Process all movies for a given letter (with parallel movie processing)."""
     safe_print(f"\n🔤 Scraping movies for letter '{letter.upper()}'")
@@ -287,25 +538,28 @@ def process_letter(letter, new_movies_counter, save_interval):
         
         safe_print(f"  📊 [{letter}] Processing {len(new_movie_pages)} new movies (out of {len(movie_pages)} total)")
         
-        # Process movies in parallel
-        with ThreadPoolExecutor(max_workers=MAX_WORKERS_MOVIES) as executor:
-            futures = [executor.submit(process_movie, mp, new_movies_counter) for mp in new_movie_pages]
-            
-            completed = 0
-            for future in as_completed(futures):
-                completed += 1
-                
-                # Save progress periodically
-                if new_movies_counter[0] % save_interval == 0 and new_movies_counter[0] > 0:
-                    with db_lock:
-                        save_to_json(movie_db, output_file)
-                        safe_print(f"    📊 Progress: {new_movies_counter[0]} new movies, {len(movie_db)} total")
+        process_movie_pages(new_movie_pages, new_movies_counter, save_interval)
         
         safe_print(f"  ✅ [{letter}] Completed processing")
         
     except Exception as e:
         safe_print(f"  ❌ Error processing letter '{letter}': {e}")
 
+# Crawl mode: full alphabetical crawl (default, periodic reconciliation) or
+# fast discovery of new releases via "--discover [sitemap|latest]"
+discover_source = None
+if '--discover' in sys.argv:
+    idx = sys.argv.index('--discover')
+    next_arg = sys.argv[idx + 1] if idx + 1 < len(sys.argv) else ""
+    discover_source = next_arg if next_arg and not next_arg.startswith('--') else "sitemap"
+    if discover_source not in ("sitemap", "latest"):
+        print("Usage: python scraper.py [--discover [sitemap|latest]] [--record]")
+        sys.exit(1)
+
+# Archive every fetched response so the DB can be re-derived offline
+if '--record' in sys.argv:
+    response_archive = ResponseArchive()
+
 # Load existing data and populate processed URLs and titles
 movie_db = load_existing_data(output_file)
 print("\n🔍 Building duplicate detection index...")
@@ -323,6 +577,9 @@ for movie in movie_db:
             if normalized:
                 processed_titles.add(normalized)
 
+# URLs already known to be reposts of a movie in the DB
+skipped_urls = load_skipped_urls(skipped_urls_file)
+
 print(f"   ✅ Indexed {len(processed_urls)} URLs")
 print(f"   ✅ Indexed {len(processed_titles)} unique titles")
 
@@ -330,6 +587,12 @@ print(f"   ✅ Indexed {len(processed_titles)} unique titles")
 if len(processed_urls) != len(processed_titles):
     duplicate_count = len(processed_urls) - len(processed_titles)
     print(f"   ⚠️  Found {duplicate_count} potential duplicate titles in existing data")
+if skipped_urls:
+    print(f"   ✅ {len(skipped_urls)} URLs previously skipped as title duplicates")
+processed_urls |= skipped_urls
+
+# Restore the crawl frontier of an interrupted run
+load_checkpoint()
 
 # Use list for thread-safe counter
 new_movies_counter = [0]
@@ -339,18 +602,37 @@ initial_count = len(movie_db)
 print(f"\n🚀 Starting scraper with PARALLEL processing...")
 print(f"   📊 Already in database: {len(movie_db)} movies")
 print(f"   🔒 Protected by: URL + Title duplicate detection")
+if discover_source:
+    print(f"🛰️  Mode: discovery ({discover_source})")
+else:
+    print(f"🔤 Mode: full alphabetical crawl")
+if response_archive is not None:
+    print(f"📼 Recording responses to: {response_archive.archive_file}")
 print(f"⚡ Settings: {MAX_WORKERS_LETTERS} letters in parallel, {MAX_WORKERS_MOVIES} movies per letter")
 print("=" * 80)
 
 start_time = time.time()
 
-# Process letters in parallel
-with ThreadPoolExecutor(max_workers=MAX_WORKERS_LETTERS) as executor:
-    futures = [executor.submit(process_letter, letter, new_movies_counter, save_interval) for letter in letters]
-    
-    # Wait for all to complete
-    for future in as_completed(futures):
-        pass  # Results are handled in process_letter
+# Finish movies that were queued or half-walked when the last run stopped
+with url_lock:
+    resumed_movie_pages = [mp for mp in frontier["pending_movies"] if mp not in processed_urls]
+if resumed_movie_pages:
+    print(f"\n♻️  Resuming {len(resumed_movie_pages)} pending movies from checkpoint")
+    process_movie_pages(resumed_movie_pages, new_movies_counter, save_interval)
+
+if discover_source:
+    # Only fetch the handful of movies that are actually new
+    new_movie_pages = discover_new_movies(discover_source)
+    if new_movie_pages:
+        process_movie_pages(new_movie_pages, new_movies_counter, save_interval)
+else:
+    # Process letters in parallel
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS_LETTERS) as executor:
+        futures = [executor.submit(process_letter, letter, new_movies_counter, save_interval) for letter in letters]
+        
+        # Wait for all to complete
+        for future in as_completed(futures):
+            pass  # Results are handled in process_letter
 
 # Final save
 elapsed_time = time.time() - start_time
@@ -358,6 +640,13 @@ elapsed_time = time.time() - start_time
 print("\n" + "=" * 80)
 with db_lock:
     save_to_json(movie_db, output_file)
+    save_skipped_urls(skipped_urls_file)
+if discover_source and not all(state["done"] for state in frontier["letters"].values()):
+    # Keep an interrupted full crawl's letter frontier for the next full run
+    compact_checkpoint()
+    print(f"♻️  Kept letter progress of the interrupted full crawl in {checkpoint_file}")
+else:
+    clear_checkpoint()
 
 print(f"\n✅ Scraping complete!")
 print(f"   - New movies scraped: {new_movies_counter[0]}")